@@ -2392,13 +2392,21 @@ def generate_report_api():
                     month = datetime.now().month
                     year = datetime.now().year
 
-            pdf_data = generate_comprehensive_report(
-                client_name=client_name,
-                cloud_provider=cloud_provider,
-                report_type=report_type,
-                credentials=credentials,
-                resources=resources,
-                frequency=frequency)
+            # Write the PDF into a temporary file directly, skipping the copy out of a BytesIO
+            temp_fd, temp_path = tempfile.mkstemp(suffix='.pdf')
+            try:
+                with os.fdopen(temp_fd, 'wb') as f:
+                    generate_comprehensive_report(
+                        client_name=client_name,
+                        cloud_provider=cloud_provider,
+                        report_type=report_type,
+                        credentials=credentials,
+                        resources=resources,
+                        frequency=frequency,
+                        output_stream=f)
+            except Exception:
+                os.remove(temp_path)
+                raise
 
         else:
             return jsonify({
@@ -2408,13 +2416,6 @@ def generate_report_api():
                 f'Report generation not implemented for {cloud_provider}'
             }), 400
 
-        # Create temporary file for the PDF
-        temp_fd, temp_path = tempfile.mkstemp(suffix='.pdf')
-        os.close(temp_fd)
-
-        with open(temp_path, 'wb') as f:
-            f.write(pdf_data)
-
         # Generate filename based on report type
         if report_type == 'utilization':
             current_date = datetime.now().strftime('%Y-%m-%d')
@@ -1,6 +1,9 @@
 import boto3
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import numpy as np
 import pytz
 import json
 import os
@@ -10,15 +13,23 @@ from typing import List, Dict, Any, Optional
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_aws_client(service: str, region: str, aws_access_key: str, aws_secret_key: str):
+# Upper bound on concurrent CloudWatch fetches per report
+MAX_METRIC_WORKERS = 16
+
+# boto3's default session is not safe for concurrent client creation
+_client_lock = threading.Lock()
+
+def get_aws_client(service: str, region: str, aws_access_key: str, aws_secret_key: str, config=None):
     """Create and return an AWS service client."""
     try:
-        return boto3.client(
-            service,
-            region_name=region,
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key
-        )
+        with _client_lock:
+            return boto3.client(
+                service,
+                region_name=region,
+                aws_access_key_id=aws_access_key,
+                aws_secret_access_key=aws_secret_key,
+                config=config
+            )
     except Exception as e:
         logger.error(f"Failed to create AWS client for {service}: {str(e)}")
         raise
@@ -129,11 +140,11 @@ def get_cloudwatch_metric_data(cloudwatch, metric_name: str, namespace: str,
         )
         
         # Create a new CloudWatch client with timeout configuration
-        cloudwatch_with_timeout = boto3.client(
+        cloudwatch_with_timeout = get_aws_client(
             'cloudwatch',
-            region_name=cloudwatch._client_config.region_name,
-            aws_access_key_id=cloudwatch._request_signer._credentials.access_key,
-            aws_secret_access_key=cloudwatch._request_signer._credentials.secret_key,
+            cloudwatch._client_config.region_name,
+            cloudwatch._request_signer._credentials.access_key,
+            cloudwatch._request_signer._credentials.secret_key,
             config=config
         )
 
@@ -313,7 +324,7 @@ def convert_bytes_to_gb(data: Dict[str, Any]) -> None:
         if 'Maximum' in point:
             point['Maximum'] = point['Maximum'] / (1024 * 1024 * 1024)
 
-def process_metric_data(metric_data: Dict[str, Any]) -> Dict[str, Any]:
+def process_metric_data(metric_data: Dict[str, Any], unit: str = 'Percent') -> Dict[str, Any]:
     """Process metric data for report generation"""
     if not metric_data or 'Datapoints' not in metric_data or not metric_data['Datapoints']:
         return {
@@ -321,26 +332,139 @@ def process_metric_data(metric_data: Dict[str, Any]) -> Dict[str, Any]:
             'values': [],
             'average': 0,
             'min': 0,
-            'max': 0
+            'max': 0,
+            'unit': unit
         }
 
     datapoints = sorted(metric_data['Datapoints'], key=lambda x: x['Timestamp'])
 
     timestamps = [point['Timestamp'] for point in datapoints]
-    values = [point.get('Average', 0) for point in datapoints]
+    # Values are kept as one float64 column; charts plot it as-is and it
+    # pickles compactly when charts are rendered in worker processes
+    values = np.fromiter((point.get('Average', 0) for point in datapoints), dtype=np.float64,
+                         count=len(datapoints))
 
-    avg_value = sum(values) / len(values) if values else 0
-    min_value = min(values) if values else 0
-    max_value = max(values) if values else 0
+    avg_value = float(values.mean())
+    min_value = float(values.min())
+    max_value = float(values.max())
 
     return {
         'timestamps': timestamps,
         'values': values,
         'average': avg_value,
         'min': min_value,
-        'max': max_value
+        'max': max_value,
+        'unit': unit
     }
 
+def get_resource_metrics(aws_access_key: str, aws_secret_key: str,
+                         resource: str, period_days: int) -> Optional[Dict[str, Any]]:
+    """Get processed metrics for a single 'service|id|region' resource."""
+    try:
+        parts = resource.split('|')
+        if len(parts) != 3:
+            # Try to infer the format if possible (for backward compatibility)
+            if len(parts) == 1:
+                # This is just an instance ID, try to determine if it's EC2 or RDS
+                resource_id = parts[0]
+                if resource_id.startswith('i-'):
+                    # Most likely an EC2 instance
+                    service_type = 'EC2'
+                    instance_id = resource_id
+                    region = 'us-east-1'  # Default to us-east-1
+                    logger.warning(f"Resource format inferred for {resource_id} as EC2 in us-east-1")
+                else:
+                    # Assume it's RDS
+                    service_type = 'RDS' 
+                    instance_id = resource_id
+                    region = 'us-east-1'  # Default to us-east-1
+                    logger.warning(f"Resource format inferred for {resource_id} as RDS in us-east-1")
+            else:
+                logger.error(f"Invalid resource format: {resource}")
+                return None
+        else:
+            service_type, instance_id, region = parts
+
+        logger.info(f"Processing {service_type} resource: {instance_id} in {region}")
+
+        if service_type == 'EC2':
+            instance_info = get_ec2_metrics(aws_access_key, aws_secret_key, instance_id, region, period_days)
+            if instance_info:
+                # Convert to the format expected by the report generator
+                processed_result = {
+                    'id': instance_id,
+                    'name': instance_info['name'],
+                    'type': instance_info['type'],
+                    'state': instance_info['state'],
+                    'os': instance_info.get('os', 'Unknown'),
+                    'region': region,
+                    'service_type': 'EC2',
+                    'metrics': {}
+                }
+
+                # Process CPU metrics
+                if 'cpu' in instance_info and instance_info['cpu']['Datapoints']:
+                    processed_result['metrics']['cpu'] = process_metric_data(instance_info['cpu'])
+
+                # Process memory metrics
+                if 'memory' in instance_info and instance_info['memory']['Datapoints']:
+                    processed_result['metrics']['memory'] = process_metric_data(instance_info['memory'])
+
+                # Process disk metrics
+                if 'disk_metrics' in instance_info:
+                    disk_metrics_processed = {}
+                    for disk_name, disk_data in instance_info['disk_metrics'].items():
+                        if disk_data and disk_data.get('Datapoints'):
+                            disk_metrics_processed[disk_name] = process_metric_data(disk_data)
+
+                    # Add processed disk metrics to the result
+                    if disk_metrics_processed:
+                        processed_result['metrics']['disk_metrics'] = disk_metrics_processed
+
+                    # Also add the main disk metric for compatibility
+                    if 'disk' in instance_info['disk_metrics'] and instance_info['disk_metrics']['disk'].get('Datapoints'):
+                        processed_result['metrics']['disk'] = process_metric_data(instance_info['disk_metrics']['disk'])
+
+                return processed_result
+
+        elif service_type == 'RDS':
+            result = get_rds_metrics(aws_access_key, aws_secret_key, instance_id, region, period_days)
+            if result:
+                # Convert to format expected by report generator
+                processed_result = {
+                    'id': result['id'],
+                    'name': result['name'],
+                    'type': result['type'],
+                    'state': result.get('status', 'Unknown'),
+                    'engine': result.get('engine', 'Unknown'),
+                    'region': result['region'],
+                    'service_type': 'RDS',
+                    'metrics': {}
+                }
+
+                # Process CPU metrics
+                if 'cpu' in result and result['cpu']['Datapoints']:
+                    processed_result['metrics']['cpu'] = process_metric_data(result['cpu'])
+
+                # Process memory metrics (convert bytes to GB)
+                if 'memory' in result and result['memory']['Datapoints']:
+                    convert_bytes_to_gb(result['memory'])
+                    processed_result['metrics']['memory'] = process_metric_data(result['memory'], unit='GB')
+
+                # Process disk metrics (convert bytes to GB)
+                if 'disk' in result and result['disk']['Datapoints']:
+                    convert_bytes_to_gb(result['disk'])
+                    processed_result['metrics']['disk'] = process_metric_data(result['disk'], unit='GB')
+
+                return processed_result
+        else:
+            logger.warning(f"Unknown service type: {service_type}")
+
+    except Exception as e:
+        logger.error(f"Failed to get metrics for {resource}: {str(e)}")
+
+    return None
+
 def get_instance_metrics(aws_access_key: str, aws_secret_key: str, 
                         resource_list: List[str], period_days: int) -> List[Dict[str, Any]]:
     """Get metrics for the selected EC2 and RDS instances."""
@@ -349,8 +473,6 @@ def get_instance_metrics(aws_access_key: str, aws_secret_key: str,
         logger.error("AWS credentials are missing")
         raise ValueError("AWS credentials are required")
 
-    metrics_data = []
-
     # Limit resources only for weekly reports to prevent timeout
     if period_days > 1 and len(resource_list) > 5:
         logger.warning(f"Limiting weekly resources from {len(resource_list)} to 5 to prevent timeout")
@@ -358,109 +480,14 @@ def get_instance_metrics(aws_access_key: str, aws_secret_key: str,
     
     logger.info(f"Processing {len(resource_list)} resources for {'weekly' if period_days > 1 else 'daily'} report")
 
-    for resource in resource_list:
-        try:
-            parts = resource.split('|')
-            if len(parts) != 3:
-                # Try to infer the format if possible (for backward compatibility)
-                if len(parts) == 1:
-                    # This is just an instance ID, try to determine if it's EC2 or RDS
-                    resource_id = parts[0]
-                    if resource_id.startswith('i-'):
-                        # Most likely an EC2 instance
-                        service_type = 'EC2'
-                        instance_id = resource_id
-                        region = 'us-east-1'  # Default to us-east-1
-                        logger.warning(f"Resource format inferred for {resource_id} as EC2 in us-east-1")
-                    else:
-                        # Assume it's RDS
-                        service_type = 'RDS' 
-                        instance_id = resource_id
-                        region = 'us-east-1'  # Default to us-east-1
-                        logger.warning(f"Resource format inferred for {resource_id} as RDS in us-east-1")
-                else:
-                    logger.error(f"Invalid resource format: {resource}")
-                    continue
-            else:
-                service_type, instance_id, region = parts
-
-            logger.info(f"Processing {service_type} resource: {instance_id} in {region}")
-
-            if service_type == 'EC2':
-                instance_info = get_ec2_metrics(aws_access_key, aws_secret_key, instance_id, region, period_days)
-                if instance_info:
-                    # Convert to the format expected by the report generator
-                    processed_result = {
-                        'id': instance_id,
-                        'name': instance_info['name'],
-                        'type': instance_info['type'],
-                        'state': instance_info['state'],
-                        'os': instance_info.get('os', 'Unknown'),
-                        'region': region,
-                        'service_type': 'EC2',
-                        'metrics': {}
-                    }
-
-                    # Process CPU metrics
-                    if 'cpu' in instance_info and instance_info['cpu']['Datapoints']:
-                        processed_result['metrics']['cpu'] = process_metric_data(instance_info['cpu'])
-
-                    # Process memory metrics
-                    if 'memory' in instance_info and instance_info['memory']['Datapoints']:
-                        processed_result['metrics']['memory'] = process_metric_data(instance_info['memory'])
-
-                    # Process disk metrics
-                    if 'disk_metrics' in instance_info:
-                        disk_metrics_processed = {}
-                        for disk_name, disk_data in instance_info['disk_metrics'].items():
-                            if disk_data and disk_data.get('Datapoints'):
-                                disk_metrics_processed[disk_name] = process_metric_data(disk_data)
-
-                        # Add processed disk metrics to the result
-                        if disk_metrics_processed:
-                            processed_result['metrics']['disk_metrics'] = disk_metrics_processed
-
-                        # Also add the main disk metric for compatibility
-                        if 'disk' in instance_info['disk_metrics'] and instance_info['disk_metrics']['disk'].get('Datapoints'):
-                            processed_result['metrics']['disk'] = process_metric_data(instance_info['disk_metrics']['disk'])
-
-                    metrics_data.append(processed_result)
-
-            elif service_type == 'RDS':
-                result = get_rds_metrics(aws_access_key, aws_secret_key, instance_id, region, period_days)
-                if result:
-                    # Convert to format expected by report generator
-                    processed_result = {
-                        'id': result['id'],
-                        'name': result['name'],
-                        'type': result['type'],
-                        'state': result.get('status', 'Unknown'),
-                        'engine': result.get('engine', 'Unknown'),
-                        'region': result['region'],
-                        'service_type': 'RDS',
-                        'metrics': {}
-                    }
-
-                    # Process CPU metrics
-                    if 'cpu' in result and result['cpu']['Datapoints']:
-                        processed_result['metrics']['cpu'] = process_metric_data(result['cpu'])
-
-                    # Process memory metrics (convert bytes to GB)
-                    if 'memory' in result and result['memory']['Datapoints']:
-                        convert_bytes_to_gb(result['memory'])
-                        processed_result['metrics']['memory'] = process_metric_data(result['memory'])
-
-                    # Process disk metrics (convert bytes to GB)
-                    if 'disk' in result and result['disk']['Datapoints']:
-                        convert_bytes_to_gb(result['disk'])
-                        processed_result['metrics']['disk'] = process_metric_data(result['disk'])
-
-                    metrics_data.append(processed_result)
-            else:
-                logger.warning(f"Unknown service type: {service_type}")
-
-        except Exception as e:
-            logger.error(f"Failed to get metrics for {resource}: {str(e)}")
-            continue
+    if not resource_list:
+        return []
 
-    return metrics_data
\ No newline at end of file
+    # CloudWatch calls are I/O bound, so fetch all resources concurrently;
+    # map() keeps the results in the order the resources were requested
+    with ThreadPoolExecutor(max_workers=min(MAX_METRIC_WORKERS, len(resource_list))) as executor:
+        results = executor.map(
+            lambda resource: get_resource_metrics(aws_access_key, aws_secret_key, resource, period_days),
+            resource_list
+        )
+        return [result for result in results if result]
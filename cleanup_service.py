@@ -114,6 +114,12 @@ class CleanupService:
             if env_var in os.environ:
                 del os.environ[env_var]
                 logger.info(f"Cleared environment variable: {env_var}")
+
+        # Drop clients and account IDs cached from client credentials
+        from ssm_utils import clear_client_caches
+        from report_generator import clear_account_id_cache
+        clear_client_caches()
+        clear_account_id_cache()
     
     def _cleanup_generated_reports(self):
         """Remove generated report files."""
@@ -1,23 +1,21 @@
 import io
 import os
+import time
 import logging
-import tempfile
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-
-# Configure matplotlib for headless environment
-matplotlib.rcParams['figure.max_open_warning'] = 0
-matplotlib.rcParams['text.usetex'] = False
-matplotlib.rcParams['mathtext.default'] = 'regular'
-matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+import functools
+from operator import itemgetter
+from typing import Optional
+import threading
+import types
+import numpy as np
+from PIL import Image as PILImage
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
 from reportlab.lib.units import inch
-from datetime import datetime, timedelta, timezone
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from datetime import datetime, timedelta, timezone, time as dt_time
 import pytz
 from io import BytesIO
 
@@ -25,28 +23,349 @@ from io import BytesIO
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_chart(timestamps, values, metric_name, instance_name, avg, min_val, max_val, service_type='EC2', period_days=1):
-    """Create a chart for the metric and return as bytes."""
+# Report timezones, looked up once rather than per chart
+IST_TZ = pytz.timezone('Asia/Kolkata')
+UTC_TZ = pytz.utc
+_IST_OFFSET = timedelta(hours=5, minutes=30)
+
+# Report colour palette, parsed once instead of on every style definition
+_NAVY = colors.HexColor('#2c3e50')
+_GREY = colors.HexColor('#bdc3c7')
+_OFFWHITE = colors.HexColor('#ecf0f1')
+_SKY_BLUE = colors.HexColor('#87CEEB')
+_LOGO_BLUE = colors.HexColor('#4A90E2')
+_LOGO_PINK = colors.HexColor('#E24A90')
+
+# Style for the CPU "Average" table
+CPU_AVG_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('BACKGROUND', (0, 0), (-1, -1), colors.white),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('PADDING', (0, 0), (-1, -1), 6),
+    ('FONTSIZE', (0, 0), (-1, -1), 11)
+])
+
+# Style for the memory and disk "Average" tables
+AVG_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('BACKGROUND', (0, 0), (0, -1), colors.white),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('PADDING', (0, 0), (-1, -1), 6)
+])
+
+# Style for the two-column label/value tables (report info, host and RDS details)
+INFO_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('BACKGROUND', (0, 0), (0, -1), colors.white),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('PADDING', (0, 0), (-1, -1), 6)
+])
+
+# Style for the "Instances Covered in Report" summary tables
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+    ('BACKGROUND', (0, 0), (-1, 0), _SKY_BLUE),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('PADDING', (0, 0), (-1, -1), 6),
+])
+
+# Column widths for the tables built once per metric, per resource and per service type
+AVG_TABLE_COL_WIDTHS = (1.5*inch, 1.5*inch)
+RESOURCE_INFO_COL_WIDTHS = (1.5*inch, 4*inch)
+SUMMARY_TABLE_COL_WIDTHS = (1.59*inch, 3*inch, 1.5*inch, 1*inch)
+
+# Shared stylesheet; getSampleStyleSheet() builds a fresh one on every call
+_STYLES = getSampleStyleSheet()
+_NORMAL_STYLE = _STYLES['Normal']
+
+# Plain-string table cells longer than this are always wrapped as Paragraphs
+SHORT_CELL_MAX_CHARS = 40
+
+# Utilization report paragraph styles, built once per process
+TITLE_STYLE = ParagraphStyle(
+    name='TitleStyle',
+    parent=_STYLES['Title'],
+    fontSize=18,
+    alignment=1,  # Center alignment
+    spaceAfter=0.2*inch
+)
+
+HEADER_STYLE = ParagraphStyle(
+    name='HeaderStyle',
+    parent=_STYLES['Heading1'],
+    fontSize=14,
+    spaceAfter=0.1*inch
+)
+
+LABEL_STYLE = ParagraphStyle(
+    name='LabelStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    spaceBefore=0.1*inch,
+    spaceAfter=0.05*inch,
+    fontName='Helvetica-Bold'
+)
+
+REMARK_STYLE = ParagraphStyle(
+    name='RemarkStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    spaceAfter=0.2*inch,
+    fontName='Helvetica-Oblique'
+)
+
+# Billing report styles
+BILLING_TITLE_STYLE = ParagraphStyle(
+    name='BillingTitleStyle',
+    parent=_STYLES['Title'],
+    fontSize=20,
+    alignment=1,  # Center alignment
+    spaceAfter=0.3*inch,
+    textColor=_NAVY,
+    fontName='Helvetica-Bold'
+)
+
+BILLING_DETAIL_STYLE = ParagraphStyle(
+    name='BillingDetailStyle',
+    parent=_STYLES['Normal'],
+    fontSize=11,
+    spaceAfter=0.1*inch,
+    fontName='Helvetica'
+)
+
+BILLING_INFO_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 1, _GREY),
+    ('BACKGROUND', (0, 0), (0, -1), _OFFWHITE),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('PADDING', (0, 0), (-1, -1), 8),
+    ('FONTSIZE', (0, 0), (-1, -1), 11)
+])
+
+# Charts reuse one (figure, axes) pair per figsize instead of building and
+# closing a figure each time. Agg rendering is not thread-safe, so all chart
+# drawing goes through _figure_lock. It is re-entrant because the first chart
+# loads matplotlib, whose warm-up draw takes the lock too.
+_figure_pool = {}
+_figure_lock = threading.RLock()
+_chart_buffer = io.BytesIO()
+
+@functools.lru_cache(maxsize=None)
+def _matplotlib():
+    """Import, configure and warm up matplotlib the first time a chart needs it.
+
+    Billing reports never chart, so processes that only build those skip the
+    import. Returns the handful of matplotlib names the chart code uses.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
+    import matplotlib.dates as mdates
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    # Configure matplotlib for headless environment
+    matplotlib.rcParams['figure.max_open_warning'] = 0
+    matplotlib.rcParams['text.usetex'] = False
+    matplotlib.rcParams['mathtext.default'] = 'regular'
+    matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+    matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    matplotlib.rcParams['pdf.fonttype'] = 42
+
+    # Load the font cache and Agg text renderer here rather than on the first chart.
+    # Like every other draw it holds _figure_lock
+    fig = Figure(figsize=(1, 1))
+    FigureCanvasAgg(fig)
+    fig.text(0, 0, '0')
+    with _figure_lock:
+        fig.canvas.draw()
+
+    return types.SimpleNamespace(
+        dates=mdates,
+        Figure=Figure,
+        FigureCanvasAgg=FigureCanvasAgg,
+        # set_major_formatter re-binds a formatter to the axis it is set on, so one instance
+        # can only be shared because _figure_lock serialises every chart that uses it.
+        # Locators are still created per chart.
+        TIME_FORMATTER=mdates.DateFormatter('%H:%M'),
+        DATE_FORMATTER=mdates.DateFormatter('%m-%d'),
+    )
+
+def _new_figure(figsize, **kwargs):
+    """Create a Figure on its own Agg canvas, outside pyplot's figure manager."""
+    mpl = _matplotlib()
+    fig = mpl.Figure(figsize=figsize, **kwargs)
+    mpl.FigureCanvasAgg(fig)
+    return fig
+
+# Longer series are downsampled to DOWNSAMPLED_PLOT_POINTS before plotting; at chart
+# resolution (600px wide) the line looks the same
+MAX_PLOT_POINTS = 1000
+DOWNSAMPLED_PLOT_POINTS = 800
+
+# Charts are placed at 6in wide, so 8in figures at 75 dpi (600x300 px) already
+# give about 100 dpi on the page
+CHART_DPI = 75
+
+# Weekly charts put each day's tick at midday
+_NOON = dt_time(12)
+
+# Characters stripped from chart titles, which matplotlib would read as mathtext
+_SANITIZE = str.maketrans('', '', '$\\')
+# Y-axis label and stats unit by metric name keyword, first match wins;
+# names matching none are plotted as CPU percent
+_UNIT_RULES = (
+    (('disk', 'storage'), "Available Storage (GB)", ''),
+    (('gb', 'memory'), "Available Memory (GB)", ''),
+)
+_DEFAULT_UNIT_RULE = "CPU Utilization (Percent)", '%'
+
+def _get_pooled_figure(figsize):
+    """Return a cleared (figure, axes) pair of the given size, creating it on first use."""
+    if figsize not in _figure_pool:
+        fig = _new_figure(figsize, dpi=CHART_DPI, facecolor='white')
+        _figure_pool[figsize] = (fig, fig.add_subplot(111))
+
+    fig, ax = _figure_pool[figsize]
+    ax.clear()
+    for text in list(fig.texts):
+        text.remove()
+    return fig, ax
+
+def render_charts(chart_jobs):
+    """Render a list of create_chart argument tuples in order."""
+    return [create_chart(*args) for args in chart_jobs]
+
+def _to_ist(ts):
+    """Convert a timestamp to IST, treating naive values as UTC."""
+    tz = ts.tzinfo
+    if tz is None:
+        return UTC_TZ.localize(ts).astimezone(IST_TZ)
+    # Already at the IST offset; the wall-clock time is what gets formatted
+    if tz.utcoffset(ts) == _IST_OFFSET:
+        return ts
+    return ts.astimezone(IST_TZ)
+
+def _parse_timestamp(timestamp):
+    """Parse a datapoint timestamp into an aware datetime, treating naive values as UTC.
+
+    Points stay in their own timezone; matplotlib plots aware datetimes by
+    their UTC instant, so only chart titles need converting to IST.
+    """
+    if isinstance(timestamp, str):
+        # fromisoformat reads the trailing 'Z' itself
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+def format_date_range(timestamps):
+    """Format the IST date range covered by timestamps for chart titles."""
+    if timestamps:
+        start_time = timestamps[0]
+        end_time = timestamps[-1]
+
+        # Convert to IST timezone for display
+        start_time_ist = _to_ist(start_time)
+        end_time_ist = _to_ist(end_time)
+
+        # Format exactly like reference image: "2025-07-21 12:38 IST to 2025-07-22 12:28 IST"
+        return f"{start_time_ist.strftime('%Y-%m-%d %H:%M')} IST to {end_time_ist.strftime('%Y-%m-%d %H:%M')} IST"
+
+    # Fallback if no timestamps available
+    now = datetime.now(IST_TZ)
+    yesterday = now - timedelta(days=1)
+    return f"{yesterday.strftime('%Y-%m-%d %H:%M')} IST to {now.strftime('%Y-%m-%d %H:%M')} IST"
+
+def create_chart(timestamps, values, metric_name, instance_name, avg=None, min_val=None, max_val=None,
+                 service_type='EC2', period_days=1, title_date_range=None):
+    """Create a chart for the metric and return as bytes.
+
+    avg, min_val and max_val are computed from values when not given.
+    title_date_range can be passed in to share one precomputed date range
+    between all charts of a resource; it is derived from timestamps otherwise.
+    """
+    with _figure_lock:
+        return _render_chart(timestamps, values, metric_name, instance_name, avg, min_val, max_val,
+                             service_type, period_days, title_date_range)
+
+def _downsample_lttb(x, y, n_out):
+    """Pick the indices of n_out points that keep the shape of the (x, y) line (LTTB)."""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    starts = edges[:-1]
+
+    # Each bucket is compared against the mean of the one after it (the last
+    # bucket against the final point), so all the means are taken up front
+    counts = np.diff(edges)
+    next_x = np.append(np.add.reduceat(x[:-1], starts)[1:] / counts[1:], x[-1]).tolist()
+    next_y = np.append(np.add.reduceat(y[:-1], starts)[1:] / counts[1:], y[-1]).tolist()
+
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i, (start, end) in enumerate(zip(starts.tolist(), edges[1:].tolist())):
+        prev_x, prev_y = x[prev], y[prev]
+        # Twice the triangle area; the factor doesn't change which point is largest
+        areas = np.abs((prev_x - next_x[i]) * (y[start:end] - prev_y)
+                       - (prev_x - x[start:end]) * (next_y[i] - prev_y))
+        prev = keep[i + 1] = start + int(areas.argmax())
+    return keep
+
+def _render_chart(timestamps, values, metric_name, instance_name, avg, min_val, max_val, service_type, period_days,
+                  title_date_range):
+    """Draw a metric chart on the pooled figure; callers must hold _figure_lock."""
     try:
-        # Clear any previous plots to prevent memory leaks
-        plt.close('all')
+        # Reuse the figure with exact dimensions to match the reference image
+        fig, ax = _get_pooled_figure((8, 4))
+        mpl = _matplotlib()
 
-        # Create figure with exact dimensions to match the reference image
-        fig = plt.figure(figsize=(8, 4), facecolor='white')
-        ax = fig.add_subplot(111)
+        # Clean names once to avoid special characters in titles
+        clean_metric_name = str(metric_name).translate(_SANITIZE)
+        clean_instance_name = str(instance_name).translate(_SANITIZE)
 
         # Skip chart creation if no data
-        if not timestamps or not values or len(timestamps) == 0:
+        if not timestamps or len(values) == 0:
             ax.text(0.5, 0.5, 'No data available', 
                    horizontalalignment='center', verticalalignment='center',
                    transform=ax.transAxes, fontsize=10)
             # Use simple ASCII title to avoid text processing issues
-            clean_instance_name = str(instance_name).replace('$', '').replace('\\', '')
-            clean_metric_name = str(metric_name).replace('$', '').replace('\\', '')
             ax.set_title(f'{clean_instance_name}: {clean_metric_name}', fontweight='bold', fontsize=10)
         else:
+            values = np.asarray(values, dtype=np.float64)
+            if avg is None:
+                avg = values.mean()
+            if min_val is None:
+                min_val = values.min()
+            if max_val is None:
+                max_val = values.max()
+
+            plot_timestamps, plot_values = timestamps, values
+            if len(values) > MAX_PLOT_POINTS:
+                # Statistics above stay exact; only the plotted line is thinned
+                epochs = np.fromiter((ts.timestamp() for ts in timestamps), dtype=np.float64,
+                                     count=len(timestamps))
+                keep = _downsample_lttb(epochs, values, DOWNSAMPLED_PLOT_POINTS)
+                plot_timestamps = [timestamps[i] for i in keep.tolist()]
+                plot_values = values[keep]
+
             # Plot the data with exact pink color from reference image
-            ax.plot(timestamps, values, color='#E91E63', linewidth=1.5, 
+            ax.plot(plot_timestamps, plot_values, color='#E91E63', linewidth=1.5, 
                    marker='o', markersize=1.5, markerfacecolor='#E91E63', alpha=1.0, label='Average')
 
             # Add average line with same pink color and dashed style
@@ -56,12 +375,8 @@ def create_chart(timestamps, values, metric_name, instance_name, avg, min_val, m
             if len(timestamps) > 1:
                 if period_days == 1:  # Daily chart
                     # For daily charts: use exactly 3-hour intervals like reference: 15:30, 18:30, 21:30, 00:30, 03:30, 06:30, 09:30
-                    ax.xaxis.set_major_locator(mdates.HourLocator(interval=3))
-                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-
                     # Set explicit limits to ensure clean time display
                     start_time = timestamps[0]
-                    end_time = timestamps[-1]
 
                     # Round start time to nearest 3-hour mark
                     start_hour = start_time.hour
@@ -69,8 +384,6 @@ def create_chart(timestamps, values, metric_name, instance_name, avg, min_val, m
                     rounded_start_hour = (start_hour // 3) * 3
 
                     # Create clean start time at rounded hour with :30 minutes for better alignment
-                    from datetime import datetime, timedelta
-
                     clean_start = start_time.replace(hour=rounded_start_hour, minute=30, second=0, microsecond=0)
                     if clean_start > start_time:
                         clean_start = clean_start - timedelta(hours=3)
@@ -88,39 +401,29 @@ def create_chart(timestamps, values, metric_name, instance_name, avg, min_val, m
                         current_time += timedelta(hours=3)
 
                     ax.set_xticks(time_ticks)
-                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+                    ax.xaxis.set_major_formatter(mpl.TIME_FORMATTER)
 
                 else:  # Weekly chart (period_days > 1)
                     # For weekly charts: show dates like 07-15, 07-16, 07-17, 07-18, etc.
                     # Set explicit time range to ensure all 7 days are shown
                     start_time = timestamps[0]
-                    end_time = timestamps[-1]
 
-                    # Create explicit date range for all 7 days using native datetime
-                    from datetime import datetime, timedelta
-
-                    # Get start date and create 7-day range
+                    # Create explicit date range for all 7 days, ticked at noon in the data's timezone
                     start_date = start_time.date()
-
-                    date_ticks = []
-                    for i in range(7):  # 7 days for weekly report
-                        current_date = start_date + timedelta(days=i)
-                        # Convert to datetime with timezone info
-                        if hasattr(start_time, 'tzinfo') and start_time.tzinfo:
-                            date_tick = datetime.combine(current_date, datetime.min.time()).replace(hour=12, tzinfo=start_time.tzinfo)
-                        else:
-                            date_tick = datetime.combine(current_date, datetime.min.time()).replace(hour=12)
-                        date_ticks.append(date_tick)
+                    date_ticks = [datetime.combine(start_date + timedelta(days=i), _NOON, tzinfo=start_time.tzinfo)
+                                  for i in range(7)]  # 7 days for weekly report
 
                     # Set the x-axis ticks and labels
                     ax.set_xticks(date_ticks)
-                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
+                    ax.xaxis.set_major_formatter(mpl.DATE_FORMATTER)
 
                     # Ensure the chart shows the full range
                     ax.set_xlim(date_ticks[0] - timedelta(hours=12), date_ticks[-1] + timedelta(hours=12))
 
                 # Don't rotate labels - keep them horizontal like in reference
-                plt.setp(ax.xaxis.get_majorticklabels(), rotation=0, ha='center')
+                for label in ax.xaxis.get_majorticklabels():
+                    label.set_rotation(0)
+                    label.set_horizontalalignment('center')
 
             # Add grid exactly like in the reference image - light gray lines
             ax.grid(True, linestyle='-', alpha=0.3, color='lightgray', linewidth=0.5)
@@ -128,48 +431,21 @@ def create_chart(timestamps, values, metric_name, instance_name, avg, min_val, m
             # Set labels exactly like in the reference image
             ax.set_xlabel('Time', fontsize=10, fontweight='normal')
 
-            # Clean metric name to avoid special characters
-            clean_metric_name = str(metric_name).replace('$', '').replace('\\', '')
-            clean_instance_name = str(instance_name).replace('$', '').replace('\\', '')
-
             # Create proper chart title with date range based on actual data timestamps
-            if timestamps:
-                start_time = timestamps[0]
-                end_time = timestamps[-1]
-
-                # Convert to IST timezone for display
-                ist_tz = pytz.timezone('Asia/Kolkata')
-                start_time_ist = start_time.astimezone(ist_tz) if start_time.tzinfo else pytz.utc.localize(start_time).astimezone(ist_tz)
-                end_time_ist = end_time.astimezone(ist_tz) if end_time.tzinfo else pytz.utc.localize(end_time).astimezone(ist_tz)
-
-                # Format exactly like reference image: "2025-07-21 12:38 IST to 2025-07-22 12:28 IST"
-                title_date_range = f"{start_time_ist.strftime('%Y-%m-%d %H:%M')} IST to {end_time_ist.strftime('%Y-%m-%d %H:%M')} IST"
-            else:
-                # Fallback if no timestamps available
-                from datetime import timedelta
-                now = datetime.now(pytz.timezone('Asia/Kolkata'))
-                yesterday = now - timedelta(days=1)
-                title_date_range = f"{yesterday.strftime('%Y-%m-%d %H:%M')} IST to {now.strftime('%Y-%m-%d %H:%M')} IST"
+            if title_date_range is None:
+                title_date_range = format_date_range(timestamps)
 
             # Create the exact title format from reference image
             chart_title = f"{clean_instance_name}: {clean_metric_name}\n{title_date_range}"
             ax.set_title(chart_title, fontweight='bold', fontsize=11, pad=15)
 
             # Set Y-axis label and format stats based on metric type
-            if ('gb' in clean_metric_name.lower() or 
-                any(word in clean_metric_name.lower() for word in ['memory', 'disk', 'storage']) or
-                service_type in ['RDS'] and 'disk' in clean_metric_name.lower()):
-                unit = 'GB'
-                # Use proper label for disk/storage metrics
-                if 'disk' in clean_metric_name.lower() or 'storage' in clean_metric_name.lower():
-                    ax.set_ylabel("Available Storage (GB)", fontsize=10)
-                else:
-                    ax.set_ylabel(f"Available Memory (GB)", fontsize=10)
-                stats_text = f"Min: {min_val:.2f} | Max: {max_val:.2f} | Avg: {avg:.2f}"
-            else:
-                # For CPU utilization, use exact format from reference
-                ax.set_ylabel("CPU Utilization (Percent)", fontsize=10)
-                stats_text = f"Min: {min_val:.2f}% | Max: {max_val:.2f}% | Avg: {avg:.2f}%"
+            metric_lower = clean_metric_name.lower()
+            ylabel, suffix = next(((label, suffix) for tokens, label, suffix in _UNIT_RULES
+                                   if any(token in metric_lower for token in tokens)),
+                                  _DEFAULT_UNIT_RULE)
+            ax.set_ylabel(ylabel, fontsize=10)
+            stats_text = f"Min: {min_val:.2f}{suffix} | Max: {max_val:.2f}{suffix} | Avg: {avg:.2f}{suffix}"
 
             # Add legend exactly like in the reference image (top right)
             legend = ax.legend(loc='upper right', frameon=True, fancybox=False, shadow=False, 
@@ -183,81 +459,114 @@ def create_chart(timestamps, values, metric_name, instance_name, avg, min_val, m
                     bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.9, edgecolor='black'))
 
         # Adjust layout to prevent overlapping and match reference spacing
-        plt.subplots_adjust(bottom=0.25, top=0.85, left=0.12, right=0.95, hspace=0.3)
+        fig.subplots_adjust(bottom=0.25, top=0.85, left=0.12, right=0.95, hspace=0.3)
 
-        # Save plot to bytes
-        buf = io.BytesIO()
+        # Save plot to bytes, reusing the chart buffer
+        buf = _chart_buffer
+        buf.seek(0)
+        buf.truncate(0)
         try:
-            fig.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
-                       facecolor='white', edgecolor='none', pad_inches=0.2)
+            # Encode the Agg canvas directly; savefig's format dispatch adds nothing here.
+            # The white figure is fully opaque, so dropping alpha is lossless and gives a
+            # smaller PNG that reportlab embeds without a soft mask
+            canvas = fig.canvas
+            canvas.draw()
+            PILImage.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(),
+                                'raw', 'RGBA', 0, 1).convert('RGB').save(buf, 'PNG', compress_level=1)
         except Exception as save_error:
             logger.warning(f"Error saving figure normally, trying fallback: {save_error}")
-            # Fallback save method
-            fig.savefig(buf, format='png', dpi=75)
-
-        plt.close(fig)  # Ensure figure is closed
-        buf.seek(0)
+            # Fallback save method; drop any partial PNG the failed save left behind
+            buf.seek(0)
+            buf.truncate(0)
+            fig.savefig(buf, format='png', dpi=CHART_DPI)
 
         return buf.getvalue()
 
     except Exception as e:
         logger.error(f"Error creating chart for {instance_name}: {str(e)}")
-        # Create minimal error chart
+        # Every failure shows the same minimal error chart
         try:
-            plt.close('all')
-            fig = plt.figure(figsize=(6, 2), facecolor='white')
-            ax = fig.add_subplot(111)
-            ax.text(0.5, 0.5, 'Chart Error', 
-                   horizontalalignment='center', verticalalignment='center',
-                   transform=ax.transAxes, fontsize=10, color='red')
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png', dpi=50)
-            plt.close(fig)
-            buf.seek(0)
-            return buf.getvalue()
+            return _error_chart_bytes()
         except Exception as fallback_error:
             logger.error(f"Error creating fallback chart: {fallback_error}")
             # Return minimal placeholder image bytes
             return b''
 
-def wrap_table_data(data):
-    """Helper function to wrap table data cells as paragraphs for better formatting"""
-    wrapped_data = []
-    styles = getSampleStyleSheet()
+@functools.lru_cache(maxsize=None)
+def _error_chart_bytes():
+    """Render the 'Chart Error' placeholder once; failures raise and are retried next time."""
+    fig = _new_figure((6, 2), facecolor='white')
+    ax = fig.add_subplot(111)
+    ax.text(0.5, 0.5, 'Chart Error', 
+           horizontalalignment='center', verticalalignment='center',
+           transform=ax.transAxes, fontsize=10, color='red')
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=50)
+    return buf.getvalue()
+
+def wrap_table_data(data, col_widths=None, font_size=10, padding=12, _P=Paragraph, _S=_NORMAL_STYLE):
+    """Wrap table cells as paragraphs, leaving strings that fit their column as they are."""
+    # Exact class checks and default-argument locals keep the per-cell cost down
+    if not col_widths:
+        return [[c if c.__class__ is _P else _P(str(c), _S) for c in row] for row in data]
+    fits = _fits_on_one_line
+    return [[c if c.__class__ is _P or (c.__class__ is str and fits(c, w - padding, font_size)) else _P(str(c), _S)
+             for c, w in zip(row, col_widths)]
+            for row in data]
+
+def _wrapped_table(data, col_widths, style, **kwargs):
+    """Build a styled Table from raw cell data, wrapping only the cells that need it."""
+    # Table defaults are 10pt text with 6pt padding either side
+    font_size, padding = 10, 6
+    for command in style.getCommands():
+        if command[0] == 'FONTSIZE':
+            font_size = max(font_size, command[3])
+        elif command[0] == 'PADDING':
+            padding = max(padding, command[3])
+    table = Table(wrap_table_data(data, col_widths, font_size, 2 * padding), colWidths=col_widths, **kwargs)
+    table.setStyle(style)
+    return table
+
+def _fits_on_one_line(text, width, font_size):
+    """Check a short plain-text cell against the space available, measured in bold."""
+    if len(text) >= SHORT_CELL_MAX_CHARS or '\n' in text:
+        return False
+    return stringWidth(text, 'Helvetica-Bold', font_size) <= width
+
+# Account IDs are re-resolved through STS once this many seconds have passed
+ACCOUNT_ID_TTL_SECONDS = 3600
+
+@functools.lru_cache(maxsize=32)
+def _lookup_account_id(client_name, ttl_bucket):
+    """Resolve the client's account ID via STS; ttl_bucket only scopes the cache entry.
+
+    Raises when the lookup fails so that failures are retried instead of cached.
+    """
+    from ssm_utils import get_credentials_for_client
+    from aws_utils import get_aws_client
 
-    for row in data:
-        wrapped_row = []
-        for cell in row:
-            if not isinstance(cell, Paragraph):
-                wrapped_row.append(Paragraph(str(cell), styles['Normal']))
-            else:
-                wrapped_row.append(cell)
-        wrapped_data.append(wrapped_row)
+    # Get credentials for the client
+    credentials = get_credentials_for_client(client_name)
+    if not credentials:
+        raise LookupError(f"No credentials found for {client_name}")
+
+    # Use STS to get account ID
+    sts = get_aws_client('sts', 'us-east-1', credentials['access_key'], credentials['secret_key'])
+    response = sts.get_caller_identity()
+    return response.get('Account', 'N/A')
 
-    return wrapped_data
+def clear_account_id_cache():
+    """Forget resolved account IDs so the next lookup goes back to STS."""
+    _lookup_account_id.cache_clear()
 
 def get_account_id_for_client(client_name):
     """Get AWS account ID for the client from SSM or return placeholder"""
     try:
-        from ssm_utils import get_credentials_for_client
-        import boto3
-
-        # Get credentials for the client
-        credentials = get_credentials_for_client(client_name)
-        if credentials:
-            # Use STS to get account ID
-            sts = boto3.client(
-                'sts',
-                aws_access_key_id=credentials['access_key'],
-                aws_secret_access_key=credentials['secret_key'],
-                region_name='us-east-1'
-            )
-            response = sts.get_caller_identity()
-            return response.get('Account', 'N/A')
+        return _lookup_account_id(client_name, int(time.time() // ACCOUNT_ID_TTL_SECONDS))
     except Exception as e:
         logger.warning(f"Could not get account ID for {client_name}: {str(e)}")
 
@@ -269,57 +578,225 @@ def get_account_id_for_client(client_name):
     }
     return account_mapping.get(client_name, 'N/A')
 
-def create_utilization_report(doc, elements, account_name, metrics_data, cloud_provider, period_days=1):
-    """Create utilization report content"""
-    styles = getSampleStyleSheet()
+# Remark thresholds as (low, high, (low remark, normal remark, high remark));
+# averages below low or above high get the matching remark
+_CPU_REMARKS = (15, 85, (
+    "Average utilisation is low. No action needed at the time.",
+    "Average utilisation is normal. No action needed at the time.",
+    "Average utilisation is high. Explore possibility of optimising the resources.",
+))
+_MEMORY_REMARKS = (50, 90, (
+    "Average utilisation is low. No action needed at the time.",
+    "Average utilisation is normal. No action needed at the time.",
+    "Memory utilization is high. Consider upgrading the instance.",
+))
+_DISK_REMARKS = (30, 85, (
+    "Average Disk utilisation is low. No action needed at the time.",
+    "Average Disk utilisation is Normal.",
+    "Average Disk utilisation is high. Explore possibility of optimising the resources.",
+))
+# RDS memory and storage are reported as free GB, so only a low bound applies
+_RDS_MEMORY_REMARKS = (1, float('inf'), (
+    "Memory availability is low. Consider upgrading the instance.",
+    "Memory availability is normal.",
+    "Memory availability is normal.",
+))
+_RDS_STORAGE_REMARKS = (5, float('inf'), (
+    "Storage availability is low. Consider increasing storage.",
+    "Storage availability is normal.",
+    "Storage availability is normal.",
+))
+
+def _remark(avg, thresholds):
+    """Pick the remark for an average from one of the threshold tables above."""
+    low, high, (low_remark, normal_remark, high_remark) = thresholds
+    if avg > high:
+        return high_remark
+    if avg < low:
+        return low_remark
+    return normal_remark
+
+def _cpu_summary(metric_data, service_type):
+    """Return the remark and display value for an average CPU utilization."""
+    avg_val = metric_data['average']
+    return _remark(avg_val, _CPU_REMARKS), f"{avg_val:.2f}%"
+
+def _memory_summary(metric_data, service_type):
+    """Return the remark and display value for an average memory metric."""
+    avg_val = metric_data['average']
+
+    if service_type in ['RDS', 'Database']:
+        if metric_data.get('unit') == 'GB':
+            avg_val_gb = avg_val
+        else:
+            # Convert bytes to GB for RDS
+            avg_val_gb = avg_val / (1024 * 1024 * 1024) if avg_val > 1000 else avg_val
+        return _remark(avg_val_gb, _RDS_MEMORY_REMARKS), f"{avg_val_gb:.2f} GB"
 
-    # Process all resources without limits
-    report_period = "weekly" if period_days and period_days > 1 else "daily"
-    logger.info(f"Generating {report_period} report for {len(metrics_data)} resources")
+    return _remark(avg_val, _MEMORY_REMARKS), f"{avg_val:.2f}%"
 
-    # Define custom styles
-    title_style = ParagraphStyle(
-        name='TitleStyle',
-        parent=styles['Title'],
-        fontSize=18,
-        alignment=1,  # Center alignment
-        spaceAfter=0.2*inch
-    )
+def _disk_summary(metric_data, service_type):
+    """Return the remark and display value for an average disk metric."""
+    avg_val = metric_data['average']
 
-    header_style = ParagraphStyle(
-        name='HeaderStyle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        spaceAfter=0.1*inch
+    if service_type in ['RDS', 'Database']:
+        if metric_data.get('unit') == 'GB':
+            avg_val_gb = avg_val
+        else:
+            # Convert bytes to GB for RDS
+            avg_val_gb = avg_val / (1024 * 1024 * 1024) if avg_val > 1000 else avg_val
+        return _remark(avg_val_gb, _RDS_STORAGE_REMARKS), f"{avg_val_gb:.2f} GB"
+
+    return _remark(avg_val, _DISK_REMARKS), f"{avg_val:.2f}%"
+
+def _disk_label(disk_name):
+    """Section label for one of a Windows instance's drives."""
+    for drive in ('C', 'D', 'E'):
+        if drive in disk_name:
+            return f"DISK {drive} FREE PERCENTAGE"
+    return "DISK UTILIZATION"
+
+def _series_date_range(timestamps, date_ranges):
+    """Format the chart title date range of one series, shared by series with the same endpoints."""
+    endpoints = (timestamps[0], timestamps[-1])
+    if endpoints not in date_ranges:
+        date_ranges[endpoints] = format_date_range(timestamps)
+    return date_ranges[endpoints]
+
+# Per-metric report sections:
+# (metrics key, section label, chart name, RDS chart name, chart label, summary function, average table style)
+_METRIC_SPECS = (
+    ('cpu', 'CPU UTILIZATION', 'CPU Utilization', 'CPU Utilization', 'CPU', _cpu_summary, CPU_AVG_TABLE_STYLE),
+    ('memory', 'MEMORY UTILIZATION', 'Memory Utilization', 'Available Memory', 'Memory', _memory_summary, AVG_TABLE_STYLE),
+)
+
+def _chart_args(metric_data, chart_name, resource_name, service_type, period_days, date_ranges):
+    """Build the create_chart argument tuple for one metric series."""
+    return (
+        metric_data['timestamps'],
+        metric_data['values'],
+        chart_name,
+        resource_name,
+        metric_data['average'],
+        metric_data['min'],
+        metric_data['max'],
+        service_type,
+        period_days,
+        _series_date_range(metric_data['timestamps'], date_ranges)
     )
 
-    subheader_style = ParagraphStyle(
-        name='SubHeaderStyle',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceAfter=0.1*inch
-    )
+def _append_metric_section(elements, chart_jobs, label, summary, avg_table_style, chart_label, chart_args):
+    """Append a metric's label, remark, average table and a reserved chart slot."""
+    remarks, display_val = summary
+
+    # Reserve the slot after the average table for the chart, rendered with the others after the loop
+    chart_jobs.append((len(elements) + 3, chart_label, chart_args))
+
+    elements.extend((
+        # Utilization title - exact format
+        Paragraph(label, LABEL_STYLE),
+        # Add remarks about utilization - exact format
+        Paragraph(f"<i>Remarks: {remarks}</i>", REMARK_STYLE),
+        # Add Average table - exact format with border; both cells are short
+        # plain strings, so they skip the wrapping pass
+        Table([["Average", display_val]], colWidths=AVG_TABLE_COL_WIDTHS, style=avg_table_style,
+              spaceAfter=0.1*inch),
+        None,
+        Spacer(1, 0.3*inch),
+    ))
+
+def _resource_block(resource, period_days, chart_jobs):
+    """Build one resource's page of flowables.
+
+    Chart jobs are appended to chart_jobs with slots relative to the returned list.
+    """
+    service_type = resource.get('service_type', 'EC2')
+
+    if service_type in ['EC2', 'VM']:
+        # Add instance details
+        heading = f"Host: {resource['name']}"
+
+        # Host information
+        info_data = [
+            ["Instance ID", resource['id']],
+            ["Type", resource['type']],
+            ["Operating System", resource.get('os', 'Linux')],
+            ["State", resource['state']]
+        ]
+    else:
+        # Add database instance details
+        heading = f"RDS Instance : {resource['name']}"
+
+        # Database information
+        info_data = [
+            ["Instance ID", resource['id']],
+            ["Type", resource['type']],
+            ["Status", resource['state']],
+            ["Engine", resource.get('engine', 'Unknown')]
+        ]
+
+    # Start a new page for each resource
+    block = [
+        PageBreak(),
+        Paragraph(heading, HEADER_STYLE),
+        _wrapped_table(info_data, RESOURCE_INFO_COL_WIDTHS, INFO_TABLE_STYLE, spaceBefore=0.2*inch),
+        Spacer(1, 0.3*inch),
+    ]
 
-    label_style = ParagraphStyle(
-        name='LabelStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceBefore=0.1*inch,
-        spaceAfter=0.05*inch,
-        fontName='Helvetica-Bold'
-    )
+    # Check if resource has metrics (skip if stopped)
+    if resource.get('state', '').lower() == 'stopped':
+        # Add note for stopped instances
+        block.extend((Paragraph("Instance is stopped - no metrics available", LABEL_STYLE), Spacer(1, 0.2*inch)))
+    else:
+        # Debug: Log what keys are in the resource
+        logger.info(f"Resource keys for {resource.get('name', 'unknown')}: {list(resource.keys())}")
+
+        # Charts whose series cover the same span share one formatted title date range
+        metrics = resource.get('metrics', {})
+        date_ranges = {}
+
+        # Check if resource has metrics and log the metrics structure
+        if 'metrics' in resource:
+            logger.info(f"Metrics keys for {resource.get('name', 'unknown')}: {list(resource['metrics'].keys())}")
+
+            # Process CPU and Memory metrics
+            for key, label, chart_name, rds_chart_name, chart_label, summarize, avg_table_style in _METRIC_SPECS:
+                metric_data = resource['metrics'].get(key)
+                if not metric_data or not metric_data.get('timestamps'):
+                    continue
+
+                chart_args = _chart_args(metric_data, rds_chart_name if service_type == 'RDS' else chart_name,
+                                         resource['name'], service_type, period_days, date_ranges)
+                _append_metric_section(block, chart_jobs, label, summarize(metric_data, service_type),
+                                       avg_table_style, chart_label, chart_args)
+
+        # Process Disk metrics - Handle both disk_metrics (multiple disks) and disk (single disk)
+        # First, try the individual disk metrics (Windows C:, D:, E: drives)
+        disk_sections = [(_disk_label(disk_name), f"Disk {disk_name} Utilization", disk_data)
+                         for disk_name, disk_data in metrics.get('disk_metrics', {}).items()
+                         if disk_data.get('timestamps')]
+
+        # If no individual disk metrics were found, try the general disk metric
+        if not disk_sections and metrics.get('disk', {}).get('timestamps'):
+            chart_name = "Disk Utilization" if service_type not in ['RDS'] else "Available Storage"
+            disk_sections.append(("DISK UTILIZATION", chart_name, metrics['disk']))
+
+        for label, chart_name, disk_data in disk_sections:
+            chart_args = _chart_args(disk_data, chart_name, resource['name'], service_type, period_days,
+                                     date_ranges)
+            _append_metric_section(block, chart_jobs, label, _disk_summary(disk_data, service_type),
+                                   AVG_TABLE_STYLE, "Disk", chart_args)
+
+    return block
 
-    remark_style = ParagraphStyle(
-        name='RemarkStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=0.1*inch,
-        fontName='Helvetica-Oblique'
-    )
+def create_utilization_report(doc, elements, account_name, metrics_data, cloud_provider, period_days=1):
+    """Create utilization report content"""
+    # Process all resources without limits
+    report_period = "weekly" if period_days and period_days > 1 else "daily"
+    logger.info(f"Generating {report_period} report for {len(metrics_data)} resources")
 
     # Cover page
-    elements.append(Paragraph(f"CLOUD UTILIZATION<br/>REPORT", title_style))
-    elements.append(Spacer(1, 0.2*inch))
+    elements.append(Paragraph(f"CLOUD UTILIZATION<br/>REPORT", TITLE_STYLE))
 
     # Get account ID for the client
     account_id = get_account_id_for_client(account_name)
@@ -333,18 +810,9 @@ def create_utilization_report(doc, elements, account_name, metrics_data, cloud_p
         ["Date", datetime.now().strftime("%Y-%m-%d")]
     ]
 
-    report_table = Table(wrap_table_data(report_data), colWidths=[1.5*inch, 3*inch])
-    report_table.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-        ('BACKGROUND', (0, 0), (0, -1), colors.white),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('PADDING', (0, 0), (-1, -1), 6)
-    ]))
+    report_table = _wrapped_table(report_data, [1.5*inch, 3*inch], INFO_TABLE_STYLE, spaceBefore=0.4*inch)
 
-    elements.append(report_table)
-    elements.append(Spacer(1, 0.4*inch))
+    elements.extend((report_table, Spacer(1, 0.4*inch)))
 
     # Group metrics by service type
     service_types = {}
@@ -356,61 +824,38 @@ def create_utilization_report(doc, elements, account_name, metrics_data, cloud_p
 
     # Add resources summary for EC2 instances
     if 'EC2' in service_types:
-        elements.append(Paragraph("Instances Covered in Report:", header_style))
-        elements.append(Spacer(1, 0.2*inch))
-
         # Create a table for EC2 instance summary
         summary_data = [["Instance ID", "Name", "Type", "Status"]]
-        for resource in service_types['EC2']:
-            summary_data.append([
-                resource['id'],
-                resource['name'],
-                resource['type'],
-                resource['state']
-            ])
+        summary_data.extend([resource['id'], resource['name'], resource['type'], resource['state']]
+                            for resource in service_types['EC2'])
 
         # Create and add the summary table
-        summary_table = Table(wrap_table_data(summary_data), colWidths=[1.59*inch, 3*inch, 1.5*inch, 1*inch])
-        summary_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#87CEEB')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('PADDING', (0, 0), (-1, -1), 6),
-        ]))
-
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.4*inch))
+        summary_table = _wrapped_table(summary_data, SUMMARY_TABLE_COL_WIDTHS, SUMMARY_TABLE_STYLE, spaceBefore=0.3*inch)
+
+        elements.extend((
+            Paragraph("Instances Covered in Report:", HEADER_STYLE),
+            summary_table,
+            Spacer(1, 0.4*inch),
+        ))
 
     # Add resources summary for RDS instances
     if 'RDS' in service_types:
-        elements.append(Paragraph("RDS Instances Covered in Report:", header_style))
-        elements.append(Spacer(1, 0.2*inch))
-
         # Create a table for RDS instance summary
         summary_data = [["Instance Name", "Type", "Status", "Engine"]]
-        for resource in service_types['RDS']:
-            summary_data.append([
-                resource['id'],
-                resource['type'],
-                resource['state'],
-                resource.get('engine', 'Unknown')
-            ])
+        summary_data.extend([resource['id'], resource['type'], resource['state'], resource.get('engine', 'Unknown')]
+                            for resource in service_types['RDS'])
 
         # Create and add the summary table
-        summary_table = Table(wrap_table_data(summary_data), colWidths=[1.59*inch, 3*inch, 1.5*inch, 1*inch])
-        summary_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#87CEEB')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('PADDING', (0, 0), (-1, -1), 6),
-        ]))
-
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.4*inch))
+        summary_table = _wrapped_table(summary_data, SUMMARY_TABLE_COL_WIDTHS, SUMMARY_TABLE_STYLE, spaceBefore=0.3*inch)
+
+        elements.extend((
+            Paragraph("RDS Instances Covered in Report:", HEADER_STYLE),
+            summary_table,
+            Spacer(1, 0.4*inch),
+        ))
+
+    # Charts are collected as (element slot, chart label, create_chart args)
+    chart_jobs = []
 
     # Process each resource with progress logging
     total_resources = len(metrics_data)
@@ -418,412 +863,54 @@ def create_utilization_report(doc, elements, account_name, metrics_data, cloud_p
         if i % 5 == 0:  # Log progress every 5 resources
             logger.info(f"Processing resource {i+1}/{total_resources}: {resource.get('name', 'unknown')}")
 
-        # Start a new page for each resource
-        elements.append(PageBreak())
-
-        service_type = resource.get('service_type', 'EC2')
-
-        if service_type in ['EC2', 'VM']:
-            # Add instance details
-            elements.append(Paragraph(f"Host: {resource['name']}", header_style))
-            elements.append(Spacer(1, 0.1*inch))
-
-            # Host information
-            host_info_data = [
-                ["Instance ID", resource['id']],
-                ["Type", resource['type']],
-                ["Operating System", resource.get('os', 'Linux')],
-                ["State", resource['state']]
-            ]
-
-            host_info_table = Table(wrap_table_data(host_info_data), colWidths=[1.5*inch, 4*inch])
-            host_info_table.setStyle(TableStyle([
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                ('BACKGROUND', (0, 0), (0, -1), colors.white),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('PADDING', (0, 0), (-1, -1), 6)
-            ]))
-
-            elements.append(host_info_table)
-            elements.append(Spacer(1, 0.3*inch))
-        else:
-            # Add database instance details
-            elements.append(Paragraph(f"RDS Instance : {resource['name']}", header_style))
-            elements.append(Spacer(1, 0.1*inch))
-
-            # Database information
-            db_info_data = [
-                ["Instance ID", resource['id']],
-                ["Type", resource['type']],
-                ["Status", resource['state']],
-                ["Engine", resource.get('engine', 'Unknown')]
-            ]
-
-            db_info_table = Table(wrap_table_data(db_info_data), colWidths=[1.5*inch, 4*inch])
-            db_info_table.setStyle(TableStyle([
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                ('BACKGROUND', (0, 0), (0, -1), colors.white),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('PADDING', (0, 0), (-1, -1), 6)
-            ]))
-
-            elements.append(db_info_table)
-            elements.append(Spacer(1, 0.3*inch))
-
-        # Check if resource has metrics (skip if stopped)
-        if resource.get('state', '').lower() == 'stopped':
-            # Add note for stopped instances
-            elements.append(Paragraph("Instance is stopped - no metrics available", label_style))
-            elements.append(Spacer(1, 0.2*inch))
+        # Chart slots come back relative to the block; shift them to where it lands
+        resource_jobs = []
+        block = _resource_block(resource, period_days, resource_jobs)
+        chart_jobs.extend((len(elements) + slot, chart_label, args) for slot, chart_label, args in resource_jobs)
+        elements.extend(block)
+
+    # Render all charts in one batch and fill in their reserved slots
+    charts = render_charts([args for _, _, args in chart_jobs])
+    for (slot, chart_label, args), chart in zip(chart_jobs, charts):
+        if chart:  # Only add if chart was successfully created
+            elements[slot] = Image(io.BytesIO(chart), width=6*inch, height=2.5*inch)
         else:
-            # Debug: Log what keys are in the resource
-            logger.info(f"Resource keys for {resource.get('name', 'unknown')}: {list(resource.keys())}")
-
-            # Check if resource has metrics and log the metrics structure
-            if 'metrics' in resource:
-                logger.info(f"Metrics keys for {resource.get('name', 'unknown')}: {list(resource['metrics'].keys())}")
-
-                # Check CPU metrics
-                if 'cpu' in resource['metrics']:
-                    cpu_data = resource['metrics']['cpu']
-                    logger.info(f"CPU data keys for {resource.get('name', 'unknown')}: {list(cpu_data.keys()) if isinstance(cpu_data, dict) else 'Not a dict'}")
-
-                    if cpu_data.get('timestamps'):
-                        # CPU utilization title - exact format
-                        elements.append(Paragraph("CPU UTILIZATION", label_style))
-
-                        # Add remarks about CPU utilization - exact format
-                        avg_val = cpu_data['average']
-
-                        if avg_val > 85:
-                            remarks = "Average utilisation is high. Explore possibility of optimising the resources."
-                        elif avg_val < 15:
-                            remarks = "Average utilisation is low. No action needed at the time."
-                        else:
-                            remarks = "Average utilisation is normal. No action needed at the time."
-
-                        elements.append(Paragraph(f"<i>Remarks: {remarks}</i>", remark_style))
-                        elements.append(Spacer(1, 0.1*inch))
-
-                        # Add Average table - exact format with border
-                        avg_table_data = [["Average", f"{avg_val:.2f}%"]]
-                        avg_table = Table(wrap_table_data(avg_table_data), colWidths=[1.5*inch, 1.5*inch])
-                        avg_table.setStyle(TableStyle([
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                            ('BACKGROUND', (0, 0), (-1, -1), colors.white),
-                            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                            ('PADDING', (0, 0), (-1, -1), 6),
-                            ('FONTSIZE', (0, 0), (-1, -1), 11)
-                        ]))
-                        elements.append(avg_table)
-                        elements.append(Spacer(1, 0.1*inch))
-
-                        # Create and add CPU chart
-                        try:
-                            cpu_chart = create_chart(
-                                cpu_data['timestamps'],
-                                cpu_data['values'],
-                                "CPU Utilization",
-                                resource['name'],
-                                cpu_data['average'],
-                                cpu_data['min'],
-                                cpu_data['max'],
-                                service_type,
-                                period_days
-                            )
-
-                            if cpu_chart:  # Only add if chart was successfully created
-                                elements.append(Image(io.BytesIO(cpu_chart), width=6*inch, height=2.5*inch))
-                            else:
-                                elements.append(Paragraph("CPU chart could not be generated", remark_style))
-                        except Exception as e:
-                            logger.error(f"Failed to create CPU chart for {resource['name']}: {str(e)}")
-                            elements.append(Paragraph("CPU chart could not be generated", remark_style))
-
-                        elements.append(Spacer(1, 0.3*inch))
-
-                # Process Memory metrics
-                if 'memory' in resource['metrics']:
-                    memory_data = resource['metrics']['memory']
-
-                    if memory_data.get('timestamps'):
-                        # Memory utilization title
-                        elements.append(Paragraph("MEMORY UTILIZATION", label_style))
-
-                        # Add remarks about memory utilization
-                        avg_val = memory_data['average']
-
-                        if service_type in ['RDS', 'Database']:
-                            # Convert bytes to GB for RDS
-                            avg_val_gb = avg_val / (1024 * 1024 * 1024) if avg_val > 1000 else avg_val
-                            if avg_val_gb < 1:
-                                remarks = "Memory availability is low. Consider upgrading the instance."
-                            else:
-                                remarks = "Memory availability is normal."
-                            display_val = f"{avg_val_gb:.2f} GB"
-                        else:
-                            if avg_val > 90:
-                                remarks = "Memory utilization is high. Consider upgrading the instance."
-                            elif avg_val < 50:
-                                remarks = "Average utilisation is low. No action needed at the time."
-                            else:
-                                remarks = "Average utilisation is normal. No action needed at the time."
-                            display_val = f"{avg_val:.2f}%"
-
-                        elements.append(Paragraph(f"<i>Remarks: {remarks}</i>", remark_style))
-                        elements.append(Spacer(1, 0.1*inch))
-
-                        # Add Average table
-                        avg_table_data = [["Average", display_val]]
-                        avg_table = Table(wrap_table_data(avg_table_data), colWidths=[1.5*inch, 1.5*inch])
-                        avg_table.setStyle(TableStyle([
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                            ('BACKGROUND', (0, 0), (0, -1), colors.white),
-                            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                            ('PADDING', (0, 0), (-1, -1), 6)
-                        ]))
-                        elements.append(avg_table)
-                        elements.append(Spacer(1, 0.1*inch))
-
-                        # Create and add Memory chart
-                        try:
-                            memory_chart = create_chart(
-                                memory_data['timestamps'],
-                                memory_data['values'],
-                                "Memory Utilization" if service_type not in ['RDS'] else "Available Memory",
-                                resource['name'],
-                                memory_data['average'],
-                                memory_data['min'],
-                                memory_data['max'],
-                                service_type,
-                                period_days
-                            )
-
-                            if memory_chart:  # Only add if chart was successfully created
-                                elements.append(Image(io.BytesIO(memory_chart), width=6*inch, height=2.5*inch))
-                            else:
-                                elements.append(Paragraph("Memory chart could not be generated", remark_style))
-                        except Exception as e:
-                            logger.error(f"Failed to create memory chart for {resource['name']}: {str(e)}")
-                            elements.append(Paragraph("Memory chart could not be generated", remark_style))
-
-                        elements.append(Spacer(1, 0.3*inch))
-
-            # Process Disk metrics - Handle both disk_metrics (multiple disks) and disk (single disk)
-            disk_metrics_processed = False
-            
-            # First, try to process individual disk metrics (Windows C:, D:, E: drives)
-            if 'metrics' in resource and 'disk_metrics' in resource['metrics']:
-                disk_metrics = resource['metrics']['disk_metrics']
-                for disk_name, disk_data in disk_metrics.items():
-                    if disk_data.get('timestamps'):
-                        disk_metrics_processed = True
-                        
-                        # Disk utilization title
-                        if 'C' in disk_name:
-                            elements.append(Paragraph("DISK C FREE PERCENTAGE", label_style))
-                        elif 'D' in disk_name:
-                            elements.append(Paragraph("DISK D FREE PERCENTAGE", label_style))
-                        elif 'E' in disk_name:
-                            elements.append(Paragraph("DISK E FREE PERCENTAGE", label_style))
-                        else:
-                            elements.append(Paragraph("DISK UTILIZATION", label_style))
-
-                        # Add remarks about disk utilization
-                        avg_val = disk_data['average']
-
-                        if avg_val > 85:
-                            remarks = "Average Disk utilisation is high. Explore possibility of optimising the resources."
-                        elif avg_val < 30:
-                            remarks = "Average Disk utilisation is low. No action needed at the time."
-                        else:
-                            remarks = "Average Disk utilisation is Normal."
-
-                        elements.append(Paragraph(f"<i>Remarks: {remarks}</i>", remark_style))
-                        elements.append(Spacer(1, 0.1*inch))
-
-                        # Add Average table
-                        avg_table_data = [["Average", f"{avg_val:.2f}%"]]
-                        avg_table = Table(wrap_table_data(avg_table_data), colWidths=[1.5*inch, 1.5*inch])
-                        avg_table.setStyle(TableStyle([
-                            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                            ('BACKGROUND', (0, 0), (0, -1), colors.white),
-                            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                            ('PADDING', (0, 0), (-1, -1), 6)
-                        ]))
-                        elements.append(avg_table)
-                        elements.append(Spacer(1, 0.1*inch))
-
-                        # Create and add Disk chart
-                        try:
-                            disk_chart = create_chart(
-                                disk_data['timestamps'],
-                                disk_data['values'],
-                                f"Disk {disk_name} Utilization",
-                                resource['name'],
-                                disk_data['average'],
-                                disk_data['min'],
-                                disk_data['max'],
-                                service_type,
-                                period_days
-                            )
-
-                            if disk_chart:  # Only add if chart was successfully created
-                                elements.append(Image(io.BytesIO(disk_chart), width=6*inch, height=2.5*inch))
-                            else:
-                                elements.append(Paragraph("Disk chart could not be generated", remark_style))
-                        except Exception as e:
-                            logger.error(f"Failed to create disk chart for {resource['name']}: {str(e)}")
-                            elements.append(Paragraph("Disk chart could not be generated", remark_style))
-
-                        elements.append(Spacer(1, 0.3*inch))
-            
-            # If no individual disk metrics were processed, try the general disk metric
-            if not disk_metrics_processed and 'metrics' in resource and 'disk' in resource['metrics']:
-                disk_data = resource['metrics']['disk']
-
-                if disk_data.get('timestamps'):
-                    # Disk utilization title
-                    elements.append(Paragraph("DISK UTILIZATION", label_style))
-
-                    # Add remarks about disk utilization
-                    avg_val = disk_data['average']
-
-                    if service_type in ['RDS', 'Database']:
-                        # Convert bytes to GB for RDS
-                        avg_val_gb = avg_val / (1024 * 1024 * 1024) if avg_val > 1000 else avg_val
-                        if avg_val_gb < 5:
-                            remarks = "Storage availability is low. Consider increasing storage."
-                        else:
-                            remarks = "Storage availability is normal."
-                        display_val = f"{avg_val_gb:.2f} GB"
-                    else:
-                        if avg_val > 85:
-                            remarks = "Average Disk utilisation is high. Explore possibility of optimising the resources."
-                        elif avg_val < 30:
-                            remarks = "Average Disk utilisation is low. No action needed at the time."
-                        else:
-                            remarks = "Average Disk utilisation is Normal."
-                        display_val = f"{avg_val:.2f}%"
-
-                    elements.append(Paragraph(f"<i>Remarks: {remarks}</i>", remark_style))
-                    elements.append(Spacer(1, 0.1*inch))
-
-                    # Add Average table
-                    avg_table_data = [["Average", display_val]]
-                    avg_table = Table(wrap_table_data(avg_table_data), colWidths=[1.5*inch, 1.5*inch])
-                    avg_table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                        ('BACKGROUND', (0, 0), (0, -1), colors.white),
-                        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ('PADDING', (0, 0), (-1, -1), 6)
-                    ]))
-                    elements.append(avg_table)
-                    elements.append(Spacer(1, 0.1*inch))
-
-                    # Create and add Disk chart
-                    disk_chart = create_chart(
-                        disk_data['timestamps'],
-                        disk_data['values'],
-                        "Disk Utilization" if service_type not in ['RDS'] else "Available Storage",
-                        resource['name'],
-                        disk_data['average'],
-                        disk_data['min'],
-                        disk_data['max'],
-                        service_type,
-                        period_days
-                    )
-
-                    elements.append(Image(io.BytesIO(disk_chart), width=6*inch, height=2.5*inch))
-                    elements.append(Spacer(1, 0.3*inch))
-
-def create_billing_report(doc, elements, account_name, cloud_provider, month, year, billing_data=None):
-    """Create billing report content with real billing data"""
-    styles = getSampleStyleSheet()
-
-    # Define custom styles for professional appearance
-    title_style = ParagraphStyle(
-        name='TitleStyle',
-        parent=styles['Title'],
-        fontSize=20,
-        alignment=1,  # Center alignment
-        spaceAfter=0.3*inch,
-        textColor=colors.HexColor('#2c3e50'),
-        fontName='Helvetica-Bold'
-    )
-
-    header_style = ParagraphStyle(
-        name='HeaderStyle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=0.15*inch,
-        textColor=colors.HexColor('#34495e'),
-        fontName='Helvetica-Bold'
-    )
+            logger.error(f"Failed to create {chart_label} chart for {args[3]}")
+            elements[slot] = Paragraph(f"{chart_label} chart could not be generated", REMARK_STYLE)
 
-    detail_style = ParagraphStyle(
-        name='DetailStyle',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=0.1*inch,
-        fontName='Helvetica'
-    )
-
-    total_style = ParagraphStyle(
-        name='TotalStyle',
-        parent=styles['Normal'],
-        fontSize=14,
-        spaceAfter=0.1*inch,
-        textColor=colors.HexColor('#e74c3c'),
-        fontName='Helvetica-Bold',
-        alignment=2  # Right alignment
-    )
+@functools.lru_cache(maxsize=32)
+def _month_name(year, month):
+    """Full month name for a billing period."""
+    return datetime(year, month, 1).strftime('%B')
 
-    month_name = datetime(year, month, 1).strftime('%B')
+def create_billing_report(doc, elements, account_name, cloud_provider, month, year, billing_data=None,
+                          generated_at=None):
+    """Create billing report content with real billing data"""
+    month_name = _month_name(year, month)
+    if generated_at is None:
+        generated_at = datetime.now()
 
     # Cover page with professional styling
-    elements.append(Paragraph(f"{cloud_provider.upper()} BILLING REPORT", title_style))
-    elements.append(Spacer(1, 0.3*inch))
+    elements.extend((Paragraph(f"{cloud_provider.upper()} BILLING REPORT", BILLING_TITLE_STYLE), Spacer(1, 0.3*inch)))
 
     # Add report information table with professional styling
     report_info_data = [
         ["Client", account_name],
         ["Report Type", "Billing Report"],
         ["Billing Period", f"{month_name} {year}"],
-        ["Report Generated", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+        ["Report Generated", generated_at.strftime("%Y-%m-%d %H:%M:%S")],
         ["Currency", "USD"]
     ]
 
-    report_table = Table(wrap_table_data(report_info_data), colWidths=[2*inch, 3.5*inch])
-    report_table.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('PADDING', (0, 0), (-1, -1), 8),
-        ('FONTSIZE', (0, 0), (-1, -1), 11)
-    ]))
-
-    elements.append(report_table)
-    elements.append(Spacer(1, 0.4*inch))
-
-    # Add billing summary text
-    elements.append(Paragraph("This report provides cost breakdown for your selected services during the billing period.", detail_style))
-    elements.append(Spacer(1, 0.4*inch))
+    report_table = _wrapped_table(report_info_data, [2*inch, 3.5*inch], BILLING_INFO_TABLE_STYLE)
+
+    elements.extend((
+        report_table,
+        Spacer(1, 0.4*inch),
+        # Add billing summary text
+        Paragraph("This report provides cost breakdown for your selected services during the billing period.", BILLING_DETAIL_STYLE),
+        Spacer(1, 0.4*inch),
+    ))
 
     # Footer text about data accuracy
     footer_text = """
@@ -835,10 +922,29 @@ def create_billing_report(doc, elements, account_name, cloud_provider, month, ye
     </font>
     </para>
     """
-    elements.append(Paragraph(footer_text, styles['Normal']))
+    elements.append(Paragraph(footer_text, _NORMAL_STYLE))
+
+LOGO_PATH = 'static/nubinix-logo.png'
+
+@functools.lru_cache(maxsize=None)
+def _logo_available():
+    """Check for the logo file once per process rather than on every page."""
+    return os.path.exists(LOGO_PATH)
+
+# Form XObject holding the page border, site name and logo shared by every page
+PAGE_CHROME_FORM = 'PageChrome'
 
 def page_template(canvas, doc):
     """Custom page template with borders and logo"""
+    # Record the chrome once per document; each page then just references the form
+    if not canvas.hasForm(PAGE_CHROME_FORM):
+        canvas.beginForm(PAGE_CHROME_FORM)
+        _draw_page_chrome(canvas)
+        canvas.endForm()
+    canvas.doForm(PAGE_CHROME_FORM)
+
+def _draw_page_chrome(canvas):
+    """Draw the page border, site name and logo."""
     canvas.saveState()
 
     # Draw page border
@@ -851,15 +957,14 @@ def page_template(canvas, doc):
     canvas.drawString(40, letter[1]-40, "www.nubinix.com")
 
     # Add Nubinix company logo in top right
-    logo_path = 'static/nubinix-logo.png'
-    if os.path.exists(logo_path):
-        # Draw the actual company logo
-        canvas.drawImage(logo_path, letter[0]-100, letter[1]-80, width=60, height=40, preserveAspectRatio=True)
+    if _logo_available():
+        # Draw the actual company logo; reportlab embeds a file path once and reuses it
+        canvas.drawImage(LOGO_PATH, letter[0]-100, letter[1]-80, width=60, height=40, preserveAspectRatio=True)
     else:
         # Fallback to simple colored logo placeholder if file not found
-        canvas.setFillColor(colors.HexColor('#4A90E2'))  # Blue color
+        canvas.setFillColor(_LOGO_BLUE)  # Blue color
         canvas.rect(letter[0]-120, letter[1]-100, 30, 30, fill=1)
-        canvas.setFillColor(colors.HexColor('#E24A90'))  # Pink color  
+        canvas.setFillColor(_LOGO_PINK)  # Pink color  
         canvas.rect(letter[0]-90, letter[1]-100, 30, 30, fill=1)
 
         # Add "nubinix" text under logo
@@ -870,12 +975,18 @@ def page_template(canvas, doc):
     canvas.restoreState()
 
 def generate_pdf_report(account_name, metrics_data=None, cloud_provider='AWS', 
-                       report_type='utilization', month=None, year=None, billing_data=None, period_days=1):
-    """Generate a PDF report with metrics data or billing information."""
+                       report_type='utilization', month=None, year=None, billing_data=None, period_days=1,
+                       generated_at=None, output_stream=None):
+    """Generate a PDF report with metrics data or billing information.
+
+    When output_stream is given the PDF is written into it and None is returned;
+    otherwise the PDF bytes are returned. reportlab assembles the whole document
+    in memory either way, so the stream only saves the final getvalue() copy.
+    """
     logger.info("Generating PDF report...")
 
-    # Create a buffer for the PDF
-    buffer = io.BytesIO()
+    # Create a buffer for the PDF unless the caller supplied somewhere to write it
+    buffer = io.BytesIO() if output_stream is None else output_stream
 
     # Create the PDF document with custom template
     doc = SimpleDocTemplate(
@@ -894,11 +1005,14 @@ def generate_pdf_report(account_name, metrics_data=None, cloud_provider='AWS',
     if report_type == 'utilization':
         create_utilization_report(doc, elements, account_name, metrics_data, cloud_provider, period_days)
     else:  # billing report
-        create_billing_report(doc, elements, account_name, cloud_provider, month, year, billing_data)
+        create_billing_report(doc, elements, account_name, cloud_provider, month, year, billing_data, generated_at)
 
     # Build the PDF document with custom page template
     doc.build(elements, onFirstPage=page_template, onLaterPages=page_template)
 
+    if output_stream is not None:
+        return None
+
     # Get the PDF data
     pdf_data = buffer.getvalue()
     buffer.close()
@@ -907,8 +1021,11 @@ def generate_pdf_report(account_name, metrics_data=None, cloud_provider='AWS',
 
 def generate_comprehensive_report(client_name: str, cloud_provider: str, report_type: str,
                                 credentials: dict, resources=None,
-                                frequency: str = 'daily') -> bytes:
-    """Generate a comprehensive report based on the request parameters."""
+                                frequency: str = 'daily', output_stream=None) -> Optional[bytes]:
+    """Generate a comprehensive report based on the request parameters.
+
+    Pass output_stream to have the PDF written into it instead of returned.
+    """
     logger.info(f"Generating {report_type} report for {client_name}")
 
     if report_type == 'utilization':
@@ -932,15 +1049,15 @@ def generate_comprehensive_report(client_name: str, cloud_provider: str, report_
             metrics_data=metrics_data,
             cloud_provider=cloud_provider,
             report_type=report_type,
-            period_days=period_days
+            period_days=period_days,
+            output_stream=output_stream
         )
 
     elif report_type == 'billing':
         # Import SSM utilities for billing data
         from ssm_utils import get_client_billing_data
-        from datetime import datetime
 
-        # Use current month/year if not specified
+        # Use current month/year if not specified; the same instant is shown as the generation time
         now = datetime.now()
         month = now.month
         year = now.year
@@ -961,7 +1078,9 @@ def generate_comprehensive_report(client_name: str, cloud_provider: str, report_
             report_type=report_type,
             month=month,
             year=year,
-            billing_data=billing_data
+            billing_data=billing_data,
+            generated_at=now,
+            output_stream=output_stream
         )
 
     else:
@@ -974,106 +1093,86 @@ def create_metric_chart_matplotlib(metric_data, metric_name, instance_name, freq
             logger.warning(f"No data available for {metric_name}")
             return None
 
-        # Extract timestamps and values
-        timestamps = []
-        values = []
-
-        for datapoint in metric_data:
-            if 'Timestamp' in datapoint and 'Average' in datapoint:
-                # Parse timestamp properly
-                timestamp = datapoint['Timestamp']
-                if isinstance(timestamp, str):
-                    # Handle string timestamps
-                    try:
-                        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    except:
-                        timestamp = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%fZ')
-                elif hasattr(timestamp, 'replace'):
-                    # It's already a datetime object, ensure it's timezone aware
-                    if timestamp.tzinfo is None:
-                        timestamp = timestamp.replace(tzinfo=timezone.utc)
-
-                # Convert to IST (UTC+5:30)
-                ist_offset = timedelta(hours=5, minutes=30)
-                if timestamp.tzinfo:
-                    timestamp = timestamp.astimezone(timezone(ist_offset))
-                else:
-                    timestamp = timestamp.replace(tzinfo=timezone.utc).astimezone(timezone(ist_offset))
-
-                timestamps.append(timestamp)
-                values.append(float(datapoint['Average']))
+        # Extract, parse and sort the (timestamp, value) pairs in one pass; sorting on
+        # the timestamp alone skips tuple comparisons and keeps ties in input order
+        pairs = sorted(((_parse_timestamp(datapoint['Timestamp']), float(datapoint['Average']))
+                        for datapoint in metric_data
+                        if 'Timestamp' in datapoint and 'Average' in datapoint),
+                       key=itemgetter(0))
 
-        if len(timestamps) == 0 or len(values) == 0:
+        if not pairs:
             logger.warning(f"No valid data points for {metric_name}")
             return None
 
-        # Sort by timestamp
-        sorted_data = sorted(zip(timestamps, values))
-        timestamps, values = zip(*sorted_data)
-
-        # Create figure and axis
-        fig, ax = plt.subplots(figsize=(12, 6))
-
-        # Plot the data
-        ax.plot(timestamps, values, color='#e74c3c', linewidth=2, marker='o', markersize=4)
-
-        # Set title and labels with proper IST formatting
-        start_time = timestamps[0].strftime("%Y-%m-%d %H:%M IST")
-        end_time = timestamps[-1].strftime("%Y-%m-%d %H:%M IST")
-        ax.set_title(f'{metric_name}\n{start_time} to {end_time}', 
-                     fontsize=14, fontweight='bold', pad=20)
-        ax.set_ylabel(f'{metric_name} (Percent)', fontsize=12)
-
-        # Format x-axis based on frequency with proper time range
-        if frequency == 'daily':
-            # For daily reports, show hours only (not dates spanning years)
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            # Set locator based on data density
-            hour_span = (timestamps[-1] - timestamps[0]).total_seconds() / 3600
-            if hour_span <= 24:
-                ax.xaxis.set_major_locator(mdates.HourLocator(interval=max(1, int(hour_span/8))))
-            else:
-                ax.xaxis.set_major_locator(mdates.HourLocator(interval=4))
-            ax.set_xlabel('Time', fontsize=12)
-        else:
-            # For weekly reports, show dates
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
-            day_span = (timestamps[-1] - timestamps[0]).days
-            if day_span <= 7:
-                ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
+        timestamps = [timestamp for timestamp, _ in pairs]
+        values = np.fromiter((value for _, value in pairs), dtype=np.float64, count=len(pairs))
+
+        # Reuse the pooled figure and axis for this size
+        with _figure_lock:
+            fig, ax = _get_pooled_figure((12, 6))
+            mpl = _matplotlib()
+
+            # Plot the data
+            ax.plot(timestamps, values, color='#e74c3c', linewidth=2, marker='o', markersize=4)
+
+            # Set title and labels with proper IST formatting
+            start_time = _to_ist(timestamps[0]).strftime("%Y-%m-%d %H:%M IST")
+            end_time = _to_ist(timestamps[-1]).strftime("%Y-%m-%d %H:%M IST")
+            ax.set_title(f'{metric_name}\n{start_time} to {end_time}', 
+                         fontsize=14, fontweight='bold', pad=20)
+            ax.set_ylabel(f'{metric_name} (Percent)', fontsize=12)
+
+            # Format x-axis based on frequency with proper time range
+            if frequency == 'daily':
+                # For daily reports, show hours only (not dates spanning years)
+                ax.xaxis.set_major_formatter(mpl.TIME_FORMATTER)
+                # Set locator based on data density
+                hour_span = (timestamps[-1] - timestamps[0]).total_seconds() / 3600
+                if hour_span <= 24:
+                    ax.xaxis.set_major_locator(mpl.dates.HourLocator(interval=max(1, int(hour_span/8))))
+                else:
+                    ax.xaxis.set_major_locator(mpl.dates.HourLocator(interval=4))
+                ax.set_xlabel('Time', fontsize=12)
             else:
-                ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, int(day_span/7))))
-            ax.set_xlabel('Date', fontsize=12)
+                # For weekly reports, show dates
+                ax.xaxis.set_major_formatter(mpl.DATE_FORMATTER)
+                day_span = (timestamps[-1] - timestamps[0]).days
+                if day_span <= 7:
+                    ax.xaxis.set_major_locator(mpl.dates.DayLocator(interval=1))
+                else:
+                    ax.xaxis.set_major_locator(mpl.dates.DayLocator(interval=max(1, int(day_span/7))))
+                ax.set_xlabel('Date', fontsize=12)
 
-        # Set x-axis limits to actual data range
-        ax.set_xlim(timestamps[0], timestamps[-1])
+            # Set x-axis limits to actual data range
+            ax.set_xlim(timestamps[0], timestamps[-1])
 
-        # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45)
+            # Rotate x-axis labels for better readability
+            ax.tick_params(axis='x', labelrotation=45)
 
-        # Add grid
-        ax.grid(True, alpha=0.3)
+            # Add grid
+            ax.grid(True, alpha=0.3)
 
-        # Add min, max, avg text box
-        min_val = min(values)
-        max_val = max(values)
-        avg_val = sum(values) / len(values)
+            # Add min, max, avg text box
+            min_val = values.min()
+            max_val = values.max()
+            avg_val = values.mean()
 
-        textstr = f'Min: {min_val:.2f}% | Max: {max_val:.2f}% | Avg: {avg_val:.2f}%'
-        props = dict(boxstyle='round', facecolor='wheat', alpha=0.8)
-        ax.text(0.5, -0.15, textstr, transform=ax.transAxes, fontsize=10,
-                horizontalalignment='center', bbox=props)
+            textstr = f'Min: {min_val:.2f}% | Max: {max_val:.2f}% | Avg: {avg_val:.2f}%'
+            props = dict(boxstyle='round', facecolor='wheat', alpha=0.8)
+            ax.text(0.5, -0.15, textstr, transform=ax.transAxes, fontsize=10,
+                    horizontalalignment='center', bbox=props)
 
-        # Adjust layout to prevent clipping
-        plt.tight_layout()
+            # Adjust layout to prevent clipping
+            fig.tight_layout()
 
-        # Save to BytesIO
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close()
+            # Save to BytesIO
+            img_buffer = BytesIO()
+            # At 75 dpi the 12x6in figure is still finer than the 6in-wide box it is drawn into
+            fig.savefig(img_buffer, format='png', dpi=CHART_DPI, bbox_inches='tight', facecolor='white',
+                        pil_kwargs={'compress_level': 1})
+            img_buffer.seek(0)
 
-        return img_buffer.getvalue()
+            return img_buffer.getvalue()
 
     except Exception as e:
         logger.error(f"Error creating chart for {metric_name}: {str(e)}")
@@ -0,0 +1,24 @@
+import numpy as np
+
+from report_generator import _downsample_lttb
+
+
+def test_downsample_lttb_keeps_endpoints_and_extremes():
+    n = 1440
+    x = np.arange(n, dtype=np.float64)
+    y = np.sin(x / 50.0) * 10 + 50
+    y[500] = 98.0  # Spike
+    y[900] = 2.0   # Dip
+
+    keep = _downsample_lttb(x, y, 800)
+
+    assert len(keep) == 800
+    assert keep[0] == 0
+    assert keep[-1] == n - 1
+    assert np.all(np.diff(keep) > 0)
+    assert int(np.argmax(y)) in keep
+    assert int(np.argmin(y)) in keep
+
+
+def test_downsample_lttb_keeps_short_series():
+    assert list(_downsample_lttb([0, 1, 2], [5, 6, 7], 800)) == [0, 1, 2]